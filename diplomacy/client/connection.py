@@ -35,17 +35,19 @@ from diplomacy.utils import exceptions, strings, constants
 LOGGER = logging.getLogger(__name__)
 
 @gen.coroutine
-def connect(hostname, port):
+def connect(hostname, port, phase_data_delta=False):
     """ Connect to given hostname and port.
 
         :param hostname: a hostname
         :param port: a port
+        :param phase_data_delta: if True, ask server to send only state changes when games are processed.
         :return: a Connection object connected.
         :type hostname: str
         :type port: int
+        :type phase_data_delta: bool
         :rtype: Connection
     """
-    connection = Connection(hostname, port)
+    connection = Connection(hostname, port, phase_data_delta=phase_data_delta)
     yield connection._connect('Trying to connect.')                 # pylint: disable=protected-access
     return connection
 
@@ -64,7 +66,9 @@ class Connection:
         - **hostname**: :class:`str` hostname to connect (e.g. 'localhost')
         - **port**: :class:`int` port to connect (e.g. 8888)
         - **use_ssl**: :class:`bool` telling if connection should be securized (True) or not (False).
-        - **url**: (property) :class:`str` websocket url to connect (generated with hostname and port)
+        - **phase_data_delta**: :class:`bool` telling if server should send state deltas instead of full states
+          in game processed notifications (negotiated with server when connecting).
+        - **url**: (property) :class:`str` websocket url to connect (generated with hostname, port and options)
         - **connection**: :class:`tornado.websocket.WebSocketClientConnection` a tornado websocket connection object
         - **connection_count**: :class:`int` number of successful connections from this Connection object.
           Used to check if message callbacks is already launched (if count > 0).
@@ -84,10 +88,10 @@ class Connection:
         - **unknown_tokens**: :class:`set` a set of unknown tokens. We can safely ignore them, as the server has been
           notified.
     """
-    __slots__ = ['hostname', 'port', 'use_ssl', 'connection', 'is_connecting', 'is_reconnecting', 'connection_count',
+    __slots__ = ['hostname', 'port', 'use_ssl', 'phase_data_delta', 'connection', 'is_connecting', 'is_reconnecting', 'connection_count',
                  'channels', 'requests_to_send', 'requests_waiting_responses', 'unknown_tokens']
 
-    def __init__(self, hostname, port, use_ssl=False):
+    def __init__(self, hostname, port, use_ssl=False, phase_data_delta=False):
         """ Constructor
 
             The connection class should not be initiated directly, but through the connect method
@@ -100,13 +104,16 @@ class Connection:
             :param hostname: hostname to connect (e.g. 'localhost')
             :param port: port to connect (e.g. 8888)
             :param use_ssl: telling if connection should be securized (True) or not (False).
+            :param phase_data_delta: telling if server should send state deltas in game processed notifications.
             :type hostname: str
             :type port: int
             :type use_ssl: bool
+            :type phase_data_delta: bool
         """
         self.hostname = hostname
         self.port = port
         self.use_ssl = bool(use_ssl)
+        self.phase_data_delta = bool(phase_data_delta)
 
         self.connection = None
         self.connection_count = 0
@@ -123,7 +130,16 @@ class Connection:
         # (we consider we are reconnected).
         self.is_reconnecting.set()
 
-    url = property(lambda self: '%s://%s:%d' % ('wss' if self.use_ssl else 'ws', self.hostname, self.port))
+    @property
+    def url(self):
+        """ Return websocket URL to connect, with connection options as query arguments.
+            Client always accepts batches of notifications.
+        """
+        options = [strings.BATCH_NOTIFICATIONS]
+        if self.phase_data_delta:
+            options.append(strings.PHASE_DATA_DELTA)
+        return '%s://%s:%d/?%s' % ('wss' if self.use_ssl else 'ws', self.hostname, self.port,
+                                   '&'.join('%s=1' % option for option in options))
 
     # ===================
     # Public Methods.
@@ -212,7 +228,8 @@ class Connection:
     @gen.coroutine
     def _on_socket_message(self, socket_message):
         """ Manage given socket_message (string),
-            that may be a string representation of either a request or a notification.
+            that may be a string representation of either a response, a notification,
+            or a list of notifications.
         """
 
         # Check response format and run callback (if defined).
@@ -222,6 +239,18 @@ class Connection:
             LOGGER.exception('Unable to parse JSON from a socket message.')
             return
 
+        if isinstance(json_message, list):
+            # Batch of notifications.
+            for json_notification in json_message:
+                yield self._on_json_message(json_notification)
+        else:
+            yield self._on_json_message(json_message)
+
+    @gen.coroutine
+    def _on_json_message(self, json_message):
+        """ Manage given JSON message, expected to be a dictionary representing
+            either a response or a notification.
+        """
         if not isinstance(json_message, dict):
             LOGGER.error("Unable to convert a JSON string to a dictionary.")
             return
@@ -155,6 +155,7 @@ class NetworkGame(Game):
     add_on_power_vote_updated = _callback_setting_method(notifications.PowerVoteUpdated)
     add_on_power_wait_flag = _callback_setting_method(notifications.PowerWaitFlag)
     add_on_powers_controllers = _callback_setting_method(notifications.PowersControllers)
+    add_on_synchronization_required = _callback_setting_method(notifications.SynchronizationRequired)
     add_on_vote_count_updated = _callback_setting_method(notifications.VoteCountUpdated)
     add_on_vote_updated = _callback_setting_method(notifications.VoteUpdated)
 
@@ -172,6 +173,7 @@ class NetworkGame(Game):
     clear_on_power_vote_updated = _callback_clearing_method(notifications.PowerVoteUpdated)
     clear_on_power_wait_flag = _callback_clearing_method(notifications.PowerWaitFlag)
     clear_on_powers_controllers = _callback_clearing_method(notifications.PowersControllers)
+    clear_on_synchronization_required = _callback_clearing_method(notifications.SynchronizationRequired)
     clear_on_vote_count_updated = _callback_clearing_method(notifications.VoteCountUpdated)
     clear_on_vote_updated = _callback_clearing_method(notifications.VoteUpdated)
 
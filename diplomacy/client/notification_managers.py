@@ -18,10 +18,14 @@
 # pylint: disable=unused-argument
 import logging
 
+from tornado.ioloop import IOLoop
+
 from diplomacy.client.network_game import NetworkGame
 from diplomacy.communication import notifications
 from diplomacy.engine.game import Game
 from diplomacy.utils import exceptions, strings
+from diplomacy.utils.game_phase_data import GamePhaseData
+from diplomacy.utils.state_delta import apply_state_delta
 
 LOGGER = logging.getLogger(__name__)
 
@@ -125,7 +129,24 @@ def on_game_processed(game, notification):
         :type game: diplomacy.client.network_game.NetworkGame
         :type notification: diplomacy.communication.notifications.GameProcessed
     """
-    game.set_phase_data([notification.previous_phase_data, notification.current_phase_data], clear_history=False)
+    previous_phase_data = notification.previous_phase_data
+    current_phase_data = notification.current_phase_data
+    if notification.phase_data_delta:
+        # States are deltas: previous state against current game state, current state against previous state.
+        previous_state = apply_state_delta(Game.get_state(game), previous_phase_data.state)
+        if previous_state is None:
+            # Game is not in expected state (e.g. a notification was missed). Ask server for full data.
+            LOGGER.warning('Game %s: unexpected state for phase data delta, synchronizing.', game.game_id)
+            IOLoop.current().spawn_callback(game.synchronize)
+            return
+        current_state = apply_state_delta(previous_state, current_phase_data.state)
+        previous_phase_data = GamePhaseData(name=previous_phase_data.name, state=previous_state,
+                                            orders=previous_phase_data.orders, results=previous_phase_data.results,
+                                            messages=previous_phase_data.messages)
+        current_phase_data = GamePhaseData(name=current_phase_data.name, state=current_state,
+                                           orders=current_phase_data.orders, results=current_phase_data.results,
+                                           messages=current_phase_data.messages)
+    game.set_phase_data([previous_phase_data, current_phase_data], clear_history=False)
 
 def on_game_phase_update(game, notification):
     """ Manage notification GamePhaseUpdate.
@@ -220,6 +241,17 @@ def on_power_wait_flag(game, notification):
     """
     Game.set_wait(game, notification.power_name, notification.wait)
 
+def on_synchronization_required(game, notification):
+    """ Manage notification SynchronizationRequired.
+
+        :param game: a Network game
+        :param notification: notification received
+        :type game: diplomacy.client.network_game.NetworkGame
+        :type notification: diplomacy.communication.notifications.SynchronizationRequired
+    """
+    LOGGER.warning('Game %s: server dropped notifications, synchronizing.', game.game_id)
+    IOLoop.current().spawn_callback(game.synchronize)
+
 def on_vote_count_updated(game, notification):
     """ Manage notification VoteCountUpdated (for observer game).
 
@@ -258,6 +290,7 @@ MAPPING = {
     notifications.PowersControllers: on_powers_controllers,
     notifications.PowerVoteUpdated: on_power_vote_updated,
     notifications.PowerWaitFlag: on_power_wait_flag,
+    notifications.SynchronizationRequired: on_synchronization_required,
     notifications.VoteCountUpdated: on_vote_count_updated,
     notifications.VoteUpdated: on_vote_updated,
 }
@@ -187,16 +187,22 @@ class GameProcessed(_GameNotification):
 
             - **previous_phase_data**: :class:`diplomacy.utils.game_phase_data.GamePhaseData` of the previous phase
             - **current_phase_data**: :class:`diplomacy.utils.game_phase_data.GamePhaseData` of the current phase
+            - **phase_data_delta**: :class:`bool` If True, state of previous phase data is a state delta
+              (see :mod:`diplomacy.utils.state_delta`) against current client game state, and state of current
+              phase data is a state delta against previous phase state. Sent only to connections which
+              asked for phase data deltas.
     """
-    __slots__ = ['previous_phase_data', 'current_phase_data']
+    __slots__ = ['previous_phase_data', 'current_phase_data', 'phase_data_delta']
     params = {
         strings.PREVIOUS_PHASE_DATA: parsing.JsonableClassType(GamePhaseData),
         strings.CURRENT_PHASE_DATA: parsing.JsonableClassType(GamePhaseData),
+        strings.PHASE_DATA_DELTA: parsing.DefaultValueType(bool, False),
     }
 
     def __init__(self, **kwargs):
         self.previous_phase_data = None  # type: GamePhaseData
         self.current_phase_data = None  # type: GamePhaseData
+        self.phase_data_delta = None  # type: bool
         super(GameProcessed, self).__init__(**kwargs)
 
 class GamePhaseUpdate(_GameNotification):
@@ -282,6 +288,13 @@ class PowerOrdersFlag(_GameNotification):
         self.order_is_set = 0
         super(PowerOrdersFlag, self).__init__(**kwargs)
 
+class SynchronizationRequired(_GameNotification):
+    """ Notification telling that server dropped notifications for a game because client did not read them
+        fast enough. Client game must synchronize (send a :class:`.Synchronize` request) to get missed updates.
+        Server does not send further notifications for this game to this client until synchronization is requested.
+    """
+    __slots__ = []
+
 class PowerWaitFlag(_GameNotification):
     """ Notification about a power wait flag update.
 
@@ -104,12 +104,18 @@ class ConnectionHandler:
         except StreamClosedError:
             LOGGER.error('Stream is closed.')
 
+    # Added for compatibility with WebSocketHandler interface
+    def close(self):
+        """ Close the connection immediately, without notifying the client """
+        self.stream.close()
+
     def on_connection_close(self):
         """ Invoked when the socket is closed (see parent method).
             Detach this connection handler from server users.
         """
         self.release_name_variant()
         self.server.users.remove_connection(self, remove_tokens=False)
+        self.server.remove_notification_queue(self)
         LOGGER.info('Removed connection. Remaining %d connection(s).', self.server.users.count_connections())
 
     @gen.coroutine
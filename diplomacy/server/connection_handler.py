@@ -35,11 +35,17 @@ class ConnectionHandler(WebSocketHandler):
     """ ConnectionHandler class. Properties:
 
         - server: server object representing running server.
+        - phase_data_delta: boolean telling if client accepts state deltas in game processed notifications.
+          Negotiated when connection is opened, with URL query argument ``phase_data_delta=1``.
+        - batch_notifications: boolean telling if client accepts many notifications in a single message
+          (as a JSON array). Negotiated with URL query argument ``batch_notifications=1``.
     """
     # pylint: disable=abstract-method
 
     def __init__(self, *args, **kwargs):
         self.server = None
+        self.phase_data_delta = False
+        self.batch_notifications = False
         super(ConnectionHandler, self).__init__(*args, **kwargs)
 
     def initialize(self, server=None):
@@ -52,6 +58,11 @@ class ConnectionHandler(WebSocketHandler):
         if self.server is None:
             self.server = server
 
+    def open(self, *args, **kwargs):
+        """ Invoked when a new connection is opened (see parent method). Read connection options. """
+        self.phase_data_delta = self.get_query_argument(strings.PHASE_DATA_DELTA, '0') == '1'
+        self.batch_notifications = self.get_query_argument(strings.BATCH_NOTIFICATIONS, '0') == '1'
+
     def get_compression_options(self):
         """ Return compression options for the connection (see parent method).
             Non-None enables compression with default options.
@@ -81,6 +92,7 @@ class ConnectionHandler(WebSocketHandler):
             Detach this connection handler from server users.
         """
         self.server.users.remove_connection(self, remove_tokens=False)
+        self.server.remove_notification_queue(self)
         LOGGER.info("Removed connection. Remaining %d connection(s).", self.server.users.count_connections())
 
     def write_message(self, message, binary=False):
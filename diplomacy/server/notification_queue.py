@@ -0,0 +1,235 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+""" Per-connection queue of notifications to send, used internally by server.
+
+    Each connection has its own queue, drained independently from other connections, so that a slow
+    client does not delay notifications for other clients. Notifications superseded by a more recent
+    notification of same kind for same recipient and power (e.g. wait flag updates) are coalesced:
+    only the most recent one is kept. Connections that accept it receive pending notifications
+    in batches (a JSON array of notifications in a single websocket message).
+
+    Number of pending notifications per connection is bounded by server attribute ``notification_queue_limit``.
+    When a queue is full, server applies its ``slow_client_policy``:
+
+    - ``resync``: pending game notifications are dropped and replaced with a
+      :class:`.SynchronizationRequired` notification for each related game. No further notification is queued
+      for these games until client sends a :class:`.Synchronize` request, which then sends client all missed data.
+    - ``disconnect``: pending notifications are dropped and connection is closed. Client is expected
+      to reconnect, and reconnection synchronizes all client games.
+
+    Notifications which cannot be dropped for a resync (e.g. channel or DAIDE notifications)
+    are handled with ``disconnect`` policy.
+"""
+import itertools
+import logging
+from collections import OrderedDict
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.websocket import WebSocketClosedError
+
+from diplomacy.communication import notifications
+from diplomacy.utils import constants, strings
+
+LOGGER = logging.getLogger(__name__)
+
+# Notifications which only carry a value overriding any previous value sent with same notification class,
+# for same token, game, game role and power.
+COALESCED_NOTIFICATIONS = (notifications.PowerOrdersFlag,
+                           notifications.PowerOrdersUpdate,
+                           notifications.PowerVoteUpdated,
+                           notifications.PowerWaitFlag,
+                           notifications.VoteCountUpdated,
+                           notifications.VoteUpdated)
+
+def get_coalescing_key(notification):
+    """ Return a key identifying notifications superseded by given notification,
+        or None if given notification cannot supersede any other notification.
+    """
+    if isinstance(notification, COALESCED_NOTIFICATIONS):
+        return (type(notification), notification.token, notification.game_id,
+                notification.game_role, notification.power_name)
+    return None
+
+class NotificationQueue:
+    """ Queue of notifications to send to a connection handler. Exists as long as connection is opened.
+
+        Properties:
+
+        - **server**: server owning this queue.
+        - **connection_handler**: connection handler to send notifications to.
+        - **notifications**: ordered dictionary mapping a key (either a coalescing key or a unique number)
+          to a pending notification.
+        - **resync_required**: set of game addresses (token, game ID, game role) for which notifications
+          were dropped, and which still have to send a Synchronize request.
+        - **sending**: boolean telling if queue is currently being drained.
+        - **closed**: boolean telling if connection was closed because of a queue overflow.
+        - **max_depth**: maximum number of pending notifications ever reached.
+        - **nb_sent**: number of notifications sent.
+        - **nb_dropped**: number of notifications dropped (coalesced notifications are not counted).
+        - **nb_overflows**: number of times queue limit was reached.
+    """
+    __slots__ = ['server', 'connection_handler', 'notifications', 'resync_required', 'sending', 'closed',
+                 'max_depth', 'nb_sent', 'nb_dropped', 'nb_overflows']
+    __counter__ = itertools.count()
+
+    def __init__(self, server, connection_handler):
+        """ Initialize a notification queue.
+
+            :param server: server owning this queue.
+            :param connection_handler: connection handler to send notifications to.
+            :type server: diplomacy.Server
+        """
+        self.server = server
+        self.connection_handler = connection_handler
+        self.notifications = OrderedDict()
+        self.resync_required = set()
+        self.sending = False
+        self.closed = False
+        self.max_depth = 0
+        self.nb_sent = 0
+        self.nb_dropped = 0
+        self.nb_overflows = 0
+
+    def __len__(self):
+        return len(self.notifications)
+
+    def put(self, notification):
+        """ Add a notification to send. Pending notification superseded by given one is removed.
+            Apply server slow client policy if queue is full. Start draining queue if not yet running.
+        """
+        if self.closed or self._get_game_address(notification) in self.resync_required:
+            self.nb_dropped += 1
+            return
+        key = get_coalescing_key(notification)
+        if key is None:
+            key = next(self.__counter__)
+        else:
+            self.notifications.pop(key, None)
+        if self.server.notification_queue_limit and len(self.notifications) >= self.server.notification_queue_limit:
+            self.nb_overflows += 1
+            if self.server.slow_client_policy != strings.RESYNC or not self._drop_for_resync(notification):
+                self._drop_and_disconnect()
+                return
+        else:
+            self.notifications[key] = notification
+        self.max_depth = max(self.max_depth, len(self.notifications))
+        if not self.sending:
+            self.sending = True
+            IOLoop.current().spawn_callback(self._send_notifications)
+
+    def synchronization_requested(self, token, game_id, game_role):
+        """ Tell queue that given game address sent a Synchronize request.
+            Notifications for this address are no more dropped.
+
+            :return: True if game address was waiting for a synchronization after dropped notifications.
+        """
+        game_address = (token, game_id, game_role)
+        if game_address in self.resync_required:
+            self.resync_required.remove(game_address)
+            return True
+        return False
+
+    def get_metrics(self):
+        """ Return a dictionary of queue metrics. """
+        return {'depth': len(self.notifications),
+                'max_depth': self.max_depth,
+                'sent': self.nb_sent,
+                'dropped': self.nb_dropped,
+                'overflows': self.nb_overflows}
+
+    @staticmethod
+    def _get_game_address(notification):
+        """ Return game address (token, game ID, game role) of given notification,
+            or None if notification is not a game notification.
+        """
+        if getattr(notification, 'level', None) == strings.GAME:
+            return notification.token, notification.game_id, notification.game_role
+        return None
+
+    def _drop_for_resync(self, notification):
+        """ Drop pending game notifications and given notification, and ask related games to synchronize.
+
+            :param notification: notification to add to full queue.
+            :return: True if queue is no more full, False otherwise (if non-game notifications fill the queue).
+        """
+        kept_notifications = OrderedDict()
+        dropped_notifications = []
+        for key, pending_notification in self.notifications.items():
+            if self._get_game_address(pending_notification) is None:
+                kept_notifications[key] = pending_notification
+            else:
+                dropped_notifications.append(pending_notification)
+        if self._get_game_address(notification) is None:
+            kept_notifications[next(self.__counter__)] = notification
+        else:
+            dropped_notifications.append(notification)
+        if len(kept_notifications) >= self.server.notification_queue_limit:
+            return False
+        LOGGER.warning('Notification queue full (%d notifications), dropping %d game notification(s).',
+                       len(self.notifications), len(dropped_notifications))
+        self.notifications = kept_notifications
+        self.nb_dropped += len(dropped_notifications)
+        for dropped_notification in dropped_notifications:
+            game_address = self._get_game_address(dropped_notification)
+            if game_address not in self.resync_required:
+                self.resync_required.add(game_address)
+                self.notifications[next(self.__counter__)] = notifications.SynchronizationRequired(
+                    token=dropped_notification.token,
+                    game_id=dropped_notification.game_id,
+                    game_role=dropped_notification.game_role,
+                    power_name=dropped_notification.power_name)
+        return True
+
+    def _drop_and_disconnect(self):
+        """ Drop all pending notifications and close connection. """
+        LOGGER.warning('Notification queue full (%d notifications), closing connection.', len(self.notifications))
+        self.nb_dropped += len(self.notifications) + 1
+        self.notifications.clear()
+        self.closed = True
+        self.connection_handler.close()
+
+    def _pop_batch(self):
+        """ Remove and return next notifications to send in a single message. """
+        if not getattr(self.connection_handler, 'batch_notifications', False):
+            return [self.notifications.popitem(last=False)[1]]
+        batch = []
+        while self.notifications and len(batch) < constants.NOTIFICATIONS_BATCH_SIZE:
+            batch.append(self.notifications.popitem(last=False)[1])
+        return batch
+
+    @gen.coroutine
+    def _send_notifications(self):
+        """ Send pending notifications until queue is empty. """
+        try:
+            while self.notifications:
+                batch = self._pop_batch()
+                try:
+                    if len(batch) == 1:
+                        yield self.connection_handler.write_message(batch[0])
+                    else:
+                        yield self.connection_handler.write_message(
+                            '[%s]' % ','.join(notification.json() for notification in batch))
+                    self.nb_sent += len(batch)
+                except (WebSocketClosedError, StreamClosedError):
+                    LOGGER.error('Connection was closed while sending notifications.')
+                    self.nb_dropped += len(batch) + len(self.notifications)
+                    self.notifications.clear()
+                    self.server.remove_notification_queue(self.connection_handler)
+        finally:
+            self.sending = False
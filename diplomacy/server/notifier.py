@@ -19,6 +19,13 @@ from tornado import gen
 
 from diplomacy.communication import notifications
 from diplomacy.utils import strings
+from diplomacy.utils.game_phase_data import GamePhaseData
+from diplomacy.utils.state_delta import compute_state_delta
+
+def _with_state(phase_data, state):
+    """ Return a copy of given phase data with given state. """
+    return GamePhaseData(name=phase_data.name, state=state, orders=phase_data.orders,
+                         results=phase_data.results, messages=phase_data.messages)
 
 class Notifier:
     """ Server notifier class. """
@@ -85,6 +92,24 @@ class Notifier:
                 for translated_notification in translated_notifications:
                     yield self.server.notifications.put((connection_handler, translated_notification))
 
+    @gen.coroutine
+    def _notify_addresses(self, game_id, addresses, notification_class, **kwargs):
+        """ Send a game notification with same parameters to many addresses.
+            Notification parameters are serialized once and shared by all sent notifications.
+
+            :param game_id: related game ID
+            :param addresses: addresses to notify. Sequence of couples (game role, token).
+            :param notification_class: class of notification to send
+            :param kwargs: (optional) other notification parameters
+        """
+        params_json = None
+        for game_role, token in addresses:
+            notification = notification_class(token=token, game_id=game_id, game_role=game_role, **kwargs)
+            if params_json is None:
+                params_json = notification.params_to_json()
+            notification.params_json = params_json
+            yield self._notify(notification)
+
     @gen.coroutine
     def _notify_game(self, server_game, notification_class, **kwargs):
         """ Send a game notification.
@@ -95,11 +120,8 @@ class Notifier:
             :param kwargs: (optional) other notification parameters
             :type server_game: diplomacy.server.server_game.ServerGame
         """
-        for game_role, token in server_game.get_reception_addresses():
-            yield self._notify(notification_class(token=token,
-                                                  game_id=server_game.game_id,
-                                                  game_role=game_role,
-                                                  **kwargs))
+        yield self._notify_addresses(
+            server_game.game_id, server_game.get_reception_addresses(), notification_class, **kwargs)
 
     @gen.coroutine
     def _notify_power(self, game_id, power, notification_class, **kwargs):
@@ -112,11 +134,8 @@ class Notifier:
             :param kwargs: (optional) other notification parameters.
             :type power: diplomacy.Power
         """
-        for token in power.tokens:
-            yield self._notify(notification_class(token=token,
-                                                  game_id=game_id,
-                                                  game_role=power.name,
-                                                  **kwargs))
+        yield self._notify_addresses(
+            game_id, [(power.name, token) for token in power.tokens], notification_class, **kwargs)
 
     @gen.coroutine
     def notify_game_processed(self, server_game, previous_phase_data, current_phase_data):
@@ -129,29 +148,37 @@ class Notifier:
             :type previous_phase_data: diplomacy.utils.game_phase_data.GamePhaseData
             :type current_phase_data: diplomacy.utils.game_phase_data.GamePhaseData
         """
-        # Send game updates to observers ans omniscient observers..
-        for game_role, token in server_game.get_observer_addresses():
-            yield self._notify(notifications.GameProcessed(
-                token=token,
-                game_id=server_game.game_id,
-                game_role=game_role,
-                previous_phase_data=server_game.filter_phase_data(previous_phase_data, strings.OBSERVER_TYPE, False),
-                current_phase_data=server_game.filter_phase_data(current_phase_data, strings.OBSERVER_TYPE, True)
-            ))
-        for game_role, token in server_game.get_omniscient_addresses():
-            yield self._notify(notifications.GameProcessed(
-                token=token,
-                game_id=server_game.game_id,
-                game_role=game_role,
-                previous_phase_data=server_game.filter_phase_data(previous_phase_data, strings.OMNISCIENT_TYPE, False),
-                current_phase_data=server_game.filter_phase_data(current_phase_data, strings.OMNISCIENT_TYPE, True)))
-        # Send game updates to powers.
-        for power in server_game.powers.values():
-            yield self._notify_power(server_game.game_id, power, notifications.GameProcessed,
-                                     previous_phase_data=server_game.filter_phase_data(
-                                         previous_phase_data, power.name, False),
-                                     current_phase_data=server_game.filter_phase_data(
-                                         current_phase_data, power.name, True))
+        # Send game updates to observers, omniscient observers and powers.
+        # Phase data is filtered and serialized once per game role.
+        # Tokens connected with phase data deltas receive only state changes.
+        # States are not filtered per role, so state deltas are computed once for all roles.
+        previous_state_delta = compute_state_delta(previous_phase_data.state, previous_phase_data.state)
+        current_state_delta = compute_state_delta(previous_phase_data.state, current_phase_data.state)
+        # Observer and omniscient tokens are stored in special powers named with their game role.
+        for power in [server_game.observer, server_game.omniscient] + list(server_game.powers.values()):
+            if not power.tokens:
+                continue
+            role_previous_phase_data = server_game.filter_phase_data(previous_phase_data, power.name, False)
+            role_current_phase_data = server_game.filter_phase_data(current_phase_data, power.name, True)
+            full_addresses = []
+            delta_addresses = []
+            for token in power.tokens:
+                connection_handler = self.server.users.get_connection_handler(token)
+                if getattr(connection_handler, 'phase_data_delta', False):
+                    delta_addresses.append((power.name, token))
+                else:
+                    full_addresses.append((power.name, token))
+            if full_addresses:
+                yield self._notify_addresses(server_game.game_id, full_addresses, notifications.GameProcessed,
+                                             previous_phase_data=role_previous_phase_data,
+                                             current_phase_data=role_current_phase_data)
+            if delta_addresses:
+                yield self._notify_addresses(server_game.game_id, delta_addresses, notifications.GameProcessed,
+                                             previous_phase_data=_with_state(role_previous_phase_data,
+                                                                             previous_state_delta),
+                                             current_phase_data=_with_state(role_current_phase_data,
+                                                                            current_state_delta),
+                                             phase_data_delta=True)
         # Also send wait flag for each power.
         for power in server_game.powers.values():
             yield self.notify_power_wait_flag(server_game, power, power.wait)
@@ -355,5 +382,4 @@ class Notifier:
             :param notification_class: class of notification to send
             :param kwargs: (optional) other parameters for notification
         """
-        for game_role, token in addresses:
-            yield self._notify(notification_class(token=token, game_id=game_id, game_role=game_role, **kwargs))
+        yield self._notify_addresses(game_id, addresses, notification_class, **kwargs)
@@ -1111,6 +1111,11 @@ def on_synchronize(server, request, connection_handler):
         assert level.game.has_omniscient_token(request.token)
     elif not level.game.power_has_token(request.game_role, request.token):
         raise exceptions.GamePlayerException()
+    # If server dropped notifications for this game, current phase must be sent in any case,
+    # as dropped notifications may have been about current phase (e.g. orders or wait flags).
+    notification_queue = server.get_notification_queue(connection_handler)
+    resync_required = notification_queue is not None and notification_queue.synchronization_requested(
+        request.token, request.game_id, request.game_role)
     messages = level.game.get_messages(request.game_role, timestamp + 1)
     if level.is_power():
         # Don't notify a power about messages she sent herself.
@@ -1118,7 +1123,7 @@ def on_synchronize(server, request, connection_handler):
                     if message.sender != level.power_name}
     phase_data_list = level.game.phase_history_from_timestamp(timestamp + 1)
     current_phase_data = None
-    if phase_data_list:
+    if phase_data_list or resync_required:
         # If there is no new state history, then current state should have not changed
         # and does not need to be sent. Otherwise current state is a new state
         # got after a processing, and must be sent.
@@ -1237,6 +1242,13 @@ MAPPING = {
     requests.Vote: on_vote,
 }
 
+@gen.coroutine
+def _handle_request_after_processing(server, request, connection_handler):
+    """ (coroutine) Wait for request game to be processed, then handle request. See handle_request(). """
+    yield server.wait_game_processing(request.game_id)
+    response = yield handle_request(server, request, connection_handler)
+    return response
+
 def handle_request(server, request, connection_handler):
     """ (coroutine) Find request handler function for associated request, run it and return its result.
 
@@ -1250,6 +1262,9 @@ def handle_request(server, request, connection_handler):
     request_handler_fn = MAPPING.get(type(request), None)
     if not request_handler_fn:
         raise exceptions.RequestException()
+    if request.level == strings.GAME and request.game_id in server.games_in_processing:
+        # Game is currently processed in a worker process. Request will be handled after processing.
+        return _handle_request_after_processing(server, request, connection_handler)
     if gen.is_coroutine_function(request_handler_fn):
         # Throw the future returned by this coroutine.
         return request_handler_fn(server, request, connection_handler)
@@ -27,18 +27,58 @@
         # run on given port.
         python -m diplomacy.server.run --port=<given port>
 
+        # run 4 independent server shards (one process per shard) on ports 8432 to 8435.
+        python -m diplomacy.server.run --shards=4
+
+    In sharded mode, each shard is a separate process owning its own games, users, scheduler and data
+    folder (``<working directory>/shard_<index>/data``), so that games processing is spread across CPU cores.
+    Clients must connect to the port of the shard hosting their games.
 """
 import argparse
+import multiprocessing
+import os
+
 from diplomacy import Server
 from diplomacy.utils import constants
 
+def run_server(port, server_dir=None):
+    """ Start a server on given port, using given server folder (default: working directory). """
+    try:
+        Server(server_dir).start(port=port)
+    except KeyboardInterrupt:
+        print('Keyboard interruption.')
+
+def run_shards(port, nb_shards):
+    """ Start given number of server shards, each in its own process.
+        Shard i runs on port (port + i) and stores data in folder ``shard_<i>`` of working directory.
+
+        :param port: port of first shard.
+        :param nb_shards: number of shards to start.
+    """
+    processes = []
+    for shard_index in range(nb_shards):
+        shard_dir = os.path.join(os.getcwd(), 'shard_%d' % shard_index)
+        os.makedirs(shard_dir, exist_ok=True)
+        process = multiprocessing.Process(target=run_server, args=(port + shard_index, shard_dir))
+        process.start()
+        processes.append(process)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Each shard receives the interruption too and saves its own data before exiting.
+        for process in processes:
+            process.join()
+
 if __name__ == '__main__':
     PARSER = argparse.ArgumentParser(description='Run server.')
     PARSER.add_argument('--port', '-p', type=int, default=constants.DEFAULT_PORT,
                         help='run on the given port (default: %s)' % constants.DEFAULT_PORT)
+    PARSER.add_argument('--shards', type=int, default=1,
+                        help='number of server processes to run on consecutive ports (default: 1)')
     ARGS = PARSER.parse_args()
 
-    try:
-        Server().start(port=ARGS.port)
-    except KeyboardInterrupt:
-        print('Keyboard interruption.')
+    if ARGS.shards > 1:
+        run_shards(ARGS.port, ARGS.shards)
+    else:
+        run_server(ARGS.port)
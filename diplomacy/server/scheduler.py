@@ -16,18 +16,25 @@
 # ==============================================================================
 """ Scheduler used by server to run games.
 
-    Scheduler is configured with a task manager (callback function) and a step time (in seconds)
-    which indicates how long it must wait at each step before checking tasks to process.
-    Then, to add a task, user must specify a data to process and a delay (in number of step times).
-    Deadline is computed using given delay + scheduler step when data was added.
+    Scheduler is configured with a task manager (callback function) and a time unit (in seconds).
+    Then, to add a task, user must specify a data to process and a delay (in number of time units).
+    Deadline is computed using given delay + scheduler time when data was added.
 
     To set unit as a minute, create Scheduler with unit_in_seconds = 60.
         In such case, a task with deadline 2 means 2 minutes to wait to process this task.
     To set unit as a second, create Scheduler with unit_in_seconds = 1.
         In such case, a task with deadline 2 means 2 seconds to wait to process this task.
+    To set unit as a millisecond, create Scheduler with unit_in_seconds = 0.001.
+
+    Scheduler does not poll: it registers one IO loop timeout at the nearest deadline, so that a task is
+    queued as soon as its deadline is reached, independently of time unit. Scheduler must be used from
+    a single Tornado IO loop, so that it does not need any lock. Due tasks are processed concurrently
+    (a task does not wait for previous tasks to be processed), but tasks for a same data are always
+    processed sequentially.
 """
 from tornado import gen
-from tornado.locks import Lock
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
 from tornado.queues import Queue
 
 from diplomacy.utils.scheduler_event import SchedulerEvent
@@ -41,8 +48,8 @@ class _Deadline:
     def __init__(self, start_time, delay):
         """ Initialize a deadline with start time and delay, so that deadline = start time + delay.
 
-            :param start_time: (int)
-            :param delay:  (int)
+            :param start_time: (float) scheduler time, in number of time units.
+            :param delay:  (int) number of time units.
         """
         self.start_time = start_time
         self.delay = delay
@@ -53,7 +60,7 @@ class _Deadline:
         return self.start_time + self.delay
 
     def __str__(self):
-        return 'Deadline(%d + %d = %d)' % (self.start_time, self.delay, self.deadline)
+        return 'Deadline(%g + %d = %g)' % (self.start_time, self.delay, self.deadline)
 
     def __lt__(self, other):
         return self.deadline < other.deadline
@@ -126,55 +133,83 @@ class _ImmediateTask(_Task):
 
 class Scheduler:
     """ (public) Scheduler class. """
-    __slots__ = ['unit', 'current_time', 'callback_process', 'data_in_queue', 'data_in_heap', 'tasks_queue', 'lock']
+    __slots__ = ['unit', 'callback_process', 'data_in_queue', 'data_in_heap', 'data_in_process', 'tasks_queue',
+                 'io_loop', 'timeout', 'timeout_deadline']
 
     def __init__(self, unit_in_seconds, callback_process):
         """ Initialize a scheduler.
 
-            :param unit_in_seconds: number of seconds to wait for each step.
+            :param unit_in_seconds: number of seconds in a time unit (may be a float lower than 1).
             :param callback_process: callback to call on every task.
 
                 - Signature: ``task_callback(task.data) -> bool``
                 - If callback return True, task is considered done and is removed from scheduler.
                 - Otherwise, task is rescheduled for another delay.
         """
-        assert isinstance(unit_in_seconds, int) and unit_in_seconds > 0
+        assert isinstance(unit_in_seconds, (int, float)) and unit_in_seconds > 0
         assert callable(callback_process)
         self.unit = unit_in_seconds
-        self.current_time = 0
         self.callback_process = callback_process
         self.data_in_heap = PriorityDict()  # data => Deadline
-        self.data_in_queue = {}  # type: dict{object, _Task}  # data => associated Task in queue
+        self.data_in_queue = {}  # type: dict{object, _Task}  # data => associated Task in queue or in process
+        self.data_in_process = {}  # type: dict{object, Future}  # data => future done when current task is processed
         self.tasks_queue = Queue()
-        # Lock to modify this object safely inside one Tornado thread:
-        # http://www.tornadoweb.org/en/stable/locks.html
-        self.lock = Lock()
+        # IO loop where scheduler runs (set when scheduler is started, see method schedule()).
+        self.io_loop = None  # type: IOLoop
+        # IO loop timeout registered to wake up scheduler at nearest deadline, and associated deadline.
+        self.timeout = None
+        self.timeout_deadline = None
+
+    @property
+    def current_time(self):
+        """ Return current scheduler time, in number of time units (float). """
+        return (self.io_loop or IOLoop.current()).time() / self.unit
 
     def _enqueue(self, task):
         """ Put a task in queue of tasks to process now. """
         self.data_in_queue[task.data] = task
         self.tasks_queue.put_nowait(task)
 
+    def _wake_up_at_nearest_deadline(self):
+        """ Make sure an IO loop timeout is registered at nearest deadline in heap, if scheduler is started. """
+        if self.io_loop is None:
+            return
+        nearest_deadline = self.data_in_heap.smallest()[0].deadline if self.data_in_heap else None
+        if nearest_deadline == self.timeout_deadline:
+            return
+        if self.timeout is not None:
+            self.io_loop.remove_timeout(self.timeout)
+            self.timeout = None
+        self.timeout_deadline = nearest_deadline
+        if nearest_deadline is not None:
+            self.timeout = self.io_loop.call_at(nearest_deadline * self.unit, self._step)
+
     @gen.coroutine
     def has_data(self, data):
         """ Return True if given data is associated to any task. """
-        with (yield self.lock.acquire()):
-            return data in self.data_in_heap or data in self.data_in_queue
+        return self.is_scheduled(data)
+
+    def is_scheduled(self, data):
+        """ Return True if given data is associated to any task.
+            Non-coroutine version of has_data(), to be used from synchronous code running in scheduler IO loop.
+        """
+        return data in self.data_in_heap or data in self.data_in_queue
 
     @gen.coroutine
     def get_info(self, data):
-        """ Return info about scheduling for given data, or None if data is not found. """
-        with (yield self.lock.acquire()):
-            deadline = None  # type: _Deadline
-            if data in self.data_in_heap:
-                deadline = self.data_in_heap[data]
-            if data in self.data_in_queue:
-                deadline = self.data_in_queue[data].deadline
-            if deadline:
-                return SchedulerEvent(time_unit=self.unit,
-                                      time_added=deadline.start_time,
-                                      delay=deadline.delay,
-                                      current_time=self.current_time)
+        """ Return info about scheduling for given data, or None if data is not found.
+            Times are rounded down to time unit.
+        """
+        deadline = None  # type: _Deadline
+        if data in self.data_in_heap:
+            deadline = self.data_in_heap[data]
+        if data in self.data_in_queue:
+            deadline = self.data_in_queue[data].deadline
+        if deadline:
+            return SchedulerEvent(time_unit=float(self.unit),
+                                  time_added=int(deadline.start_time),
+                                  delay=deadline.delay,
+                                  current_time=int(self.current_time))
         return None
 
     @gen.coroutine
@@ -186,11 +221,11 @@ class Scheduler:
         """
         if not isinstance(nb_units_to_wait, int) or nb_units_to_wait <= 0:
             raise exceptions.NaturalIntegerNotNullException()
-        with (yield self.lock.acquire()):
-            if data in self.data_in_heap or data in self.data_in_queue:
-                raise exceptions.AlreadyScheduledException()
-            # Add task to scheduler.
-            self.data_in_heap[data] = _Deadline(self.current_time, nb_units_to_wait)
+        if data in self.data_in_heap or data in self.data_in_queue:
+            raise exceptions.AlreadyScheduledException()
+        # Add task to scheduler.
+        self.data_in_heap[data] = _Deadline(self.current_time, nb_units_to_wait)
+        self._wake_up_at_nearest_deadline()
 
     @gen.coroutine
     def no_wait(self, data, nb_units_to_wait, processing_validator):
@@ -204,53 +239,85 @@ class Scheduler:
         """
         if not isinstance(nb_units_to_wait, int) or nb_units_to_wait < 0:
             raise exceptions.NaturalIntegerException()
-        with (yield self.lock.acquire()):
-            if data in self.data_in_heap:
-                # Move data from heap to queue with new delay.
-                del self.data_in_heap[data]
-                self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
-            elif data in self.data_in_queue:
-                # Change delay for future scheduling.
-                self.data_in_queue[data].update_delay(nb_units_to_wait)
-            else:
-                # Add data to queue.
-                self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
+        if data in self.data_in_heap:
+            # Move data from heap to queue with new delay.
+            del self.data_in_heap[data]
+            self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
+            self._wake_up_at_nearest_deadline()
+        elif data in self.data_in_queue:
+            # Change delay for future scheduling.
+            self.data_in_queue[data].update_delay(nb_units_to_wait)
+        else:
+            # Add data to queue.
+            self._enqueue(_ImmediateTask(data, nb_units_to_wait, processing_validator))
 
     @gen.coroutine
     def remove_data(self, data):
         """ Remove a data (and all associated tasks) from scheduler. """
-        with (yield self.lock.acquire()):
-            if data in self.data_in_heap:
-                del self.data_in_heap[data]
-            elif data in self.data_in_queue:
-                # Remove task from data_in_queue and invalidate it in queue.
-                self.data_in_queue.pop(data).valid = False
+        if data in self.data_in_heap:
+            del self.data_in_heap[data]
+            self._wake_up_at_nearest_deadline()
+        elif data in self.data_in_queue:
+            # Remove task from data_in_queue and invalidate it in queue.
+            self.data_in_queue.pop(data).valid = False
 
-    @gen.coroutine
     def _step(self):
-        """ Compute a step (check and enqueue tasks to run now) in scheduler. """
-        with (yield self.lock.acquire()):
-            self.current_time += 1
-            while self.data_in_heap:
-                deadline, data = self.data_in_heap.smallest()
-                if deadline.deadline > self.current_time:
-                    break
-                del self.data_in_heap[data]
-                self._enqueue(_Task(data, deadline))
+        """ IO loop timeout callback: enqueue tasks to run now, and wait for next nearest deadline. """
+        self.timeout = None
+        self.timeout_deadline = None
+        current_time = self.current_time
+        while self.data_in_heap:
+            deadline, data = self.data_in_heap.smallest()
+            if deadline.deadline > current_time:
+                break
+            del self.data_in_heap[data]
+            self._enqueue(_Task(data, deadline))
+        self._wake_up_at_nearest_deadline()
 
     @gen.coroutine
     def schedule(self):
-        """ Main scheduler method (callback to register in ioloop). Wait for unit seconds and
-            run tasks after each wait time.
-        """
-        while True:
-            yield gen.sleep(self.unit)
-            yield self._step()
+        """ Main scheduler method (callback to register in ioloop). Start waiting for tasks deadlines. """
+        self.io_loop = IOLoop.current()
+        self._wake_up_at_nearest_deadline()
+
+    @gen.coroutine
+    def _process_task(self, task):
+        """ Process given task and reschedule it if necessary. See method process_tasks(). """
+        # Wait for any other task processing for same data.
+        # Waited future is resolved only once other task is fully done, so that this loop never spins.
+        while task.data in self.data_in_process:
+            yield self.data_in_process[task.data]
+        if not task.valid or (isinstance(task, _ImmediateTask) and not task.can_still_process()):
+            if self.data_in_queue.get(task.data, None) is task:
+                del self.data_in_queue[task.data]
+            return
+        processing_done = self.data_in_process[task.data] = Future()
+        remove_data = True
+        try:
+            remove_data = yield self._run_callback(task.data)
+        finally:
+            del self.data_in_process[task.data]
+            processing_done.set_result(None)
+            # Task may have been invalidated (data removed from scheduler) while processing.
+            if task.valid:
+                del self.data_in_queue[task.data]
+        if task.valid and not remove_data and task.deadline.delay:
+            self.data_in_heap[task.data] = _Deadline(self.current_time, task.deadline.delay)
+            self._wake_up_at_nearest_deadline()
+
+    @gen.coroutine
+    def _run_callback(self, data):
+        """ Run processing callback on given data and return callback result. """
+        if gen.is_coroutine_function(self.callback_process):
+            result = yield self.callback_process(data)
+        else:
+            result = self.callback_process(data)
+        return result
 
     @gen.coroutine
     def process_tasks(self):
-        """ Main task processing method (callback to register in ioloop). Consume and process tasks in queue
-            and reschedule processed tasks when relevant.
+        """ Main task processing method (callback to register in ioloop). Consume tasks in queue
+            and process each of them concurrently, rescheduling processed tasks when relevant.
 
             A task is processed if associated data was not removed from scheduler.
 
@@ -260,15 +327,6 @@ class Scheduler:
         while True:
             task = yield self.tasks_queue.get()  # type: _Task
             try:
-                if task.valid and (not isinstance(task, _ImmediateTask) or task.can_still_process()):
-                    if gen.is_coroutine_function(self.callback_process):
-                        remove_data = yield self.callback_process(task.data)
-                    else:
-                        remove_data = self.callback_process(task.data)
-                    remove_data = remove_data or not task.deadline.delay
-                    with (yield self.lock.acquire()):
-                        del self.data_in_queue[task.data]
-                        if not remove_data:
-                            self.data_in_heap[task.data] = _Deadline(self.current_time, task.deadline.delay)
+                IOLoop.current().spawn_callback(self._process_task, task)
             finally:
                 self.tasks_queue.task_done()
@@ -53,24 +53,39 @@
       further game creation requests. If 0, no limit. (default 0)
     - **remove_canceled_games**: (bool) indicate if games must be deleted from server database
       when they are canceled (default False)
+    - **max_resident_games**: (int) maximum number of games server keeps loaded in memory.
+      When exceeded, least recently used idle games (games with no token attached to a connection,
+      not scheduled and without dummy powers waiting for a bot) are saved on disk and removed from memory.
+      They are transparently reloaded by get_game() when needed. If 0, no limit. (default 0)
+    - **processing_workers**: (int) number of worker processes used to process games phases.
+      If 0, games are processed directly in server IO loop. Otherwise, games are processed in a pool
+      of worker processes, so that IO loop keeps serving other games meanwhile. (default 0)
+    - **notification_queue_limit**: (int) maximum number of notifications server keeps pending for a connection
+      that does not read them fast enough. If 0, no limit. (default 1000)
+    - **slow_client_policy**: (str) what to do when a connection notification queue is full (default 'resync'):
+
+      - 'resync': drop pending game notifications and ask client to synchronize related games.
+      - 'disconnect': drop pending notifications and close connection (client is expected to reconnect).
 
 """
 import atexit
 import base64
 import logging
+import multiprocessing
 import os
 from random import randint
 import socket
 import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Set, List
 
 import tornado
 import tornado.web
 from tornado import gen
+from tornado.concurrent import Future
 from tornado.ioloop import IOLoop
-from tornado.iostream import StreamClosedError
 from tornado.queues import Queue
-from tornado.websocket import WebSocketClosedError
 
 import ujson as json
 
@@ -78,9 +93,10 @@ import diplomacy.settings
 from diplomacy.communication import notifications
 from diplomacy.daide.server import Server as DaideServer
 from diplomacy.server.connection_handler import ConnectionHandler
+from diplomacy.server.notification_queue import NotificationQueue
 from diplomacy.server.notifier import Notifier
 from diplomacy.server.scheduler import Scheduler
-from diplomacy.server.server_game import ServerGame
+from diplomacy.server.server_game import ServerGame, process_game_data
 from diplomacy.server.users import Users
 from diplomacy.engine.map import Map
 from diplomacy.utils import common, exceptions, strings, constants
@@ -195,8 +211,10 @@ class _ServerBackend:
 
 class Server:
     """ Server class. """
-    __slots__ = ['data_path', 'games_path', 'available_maps', 'maps_mtime', 'notifications',
-                 'games_scheduler', 'allow_registrations', 'max_games', 'remove_canceled_games', 'users', 'games',
+    __slots__ = ['data_path', 'games_path', 'available_maps', 'maps_mtime', 'notifications', 'notification_queues',
+                 'games_scheduler', 'allow_registrations', 'max_games', 'max_resident_games', 'remove_canceled_games',
+                 'processing_workers', 'processing_pool', 'games_in_processing', 'notification_queue_limit',
+                 'slow_client_policy', 'users', 'games',
                  'daide_servers', 'backup_server', 'backup_games', 'backup_delay_seconds', 'ping_seconds',
                  'interruption_handler', 'backend', 'games_with_dummy_powers', 'dispatched_dummy_powers']
 
@@ -233,6 +251,9 @@ class Server:
 
         # Data in memory (not stored on disk).
         self.notifications = Queue()
+        # Dictionary mapping a connection handler to its queue of notifications not yet sent.
+        # A queue is removed when its connection is closed.
+        self.notification_queues = {}  # type: Dict[object, NotificationQueue]
         self.games_scheduler = Scheduler(1, self._process_game)
         self.backup_server = None
         self.backup_games = {}
@@ -244,6 +265,10 @@ class Server:
         # Database (stored on disk).
         self.allow_registrations = True
         self.max_games = 0
+        self.max_resident_games = 0
+        self.processing_workers = 0
+        self.notification_queue_limit = constants.DEFAULT_NOTIFICATION_QUEUE_LIMIT
+        self.slow_client_policy = strings.RESYNC
         self.remove_canceled_games = False
         self.backup_delay_seconds = constants.DEFAULT_BACKUP_DELAY_SECONDS
         self.ping_seconds = constants.DEFAULT_PING_SECONDS
@@ -254,7 +279,14 @@ class Server:
         # Server games loaded on memory (stored on disk).
         # Saved separately (each game in one JSON file).
         # Each game also stores tokens connected (player tokens, observer tokens, omniscient tokens).
-        self.games = {}  # type: Dict[str, ServerGame]
+        # Games are ordered from least to most recently used (see get_game()).
+        self.games = OrderedDict()  # type: Dict[str, ServerGame]
+
+        # Pool of worker processes used to process games if processing_workers > 0 (created on first use).
+        self.processing_pool = None  # type: ProcessPoolExecutor
+
+        # Dictionary mapping ID of a game currently processed in processing pool to associated processing future.
+        self.games_in_processing = {}  # type: Dict[str, Future]
 
         # Dictionary mapping game ID to list of power names.
         self.games_with_dummy_powers = {}  # type: Dict[str, List[str]]
@@ -273,10 +305,16 @@ class Server:
         # If necessary, updated server configurable attributes from kwargs.
         self.allow_registrations = bool(kwargs.pop(strings.ALLOW_REGISTRATIONS, self.allow_registrations))
         self.max_games = int(kwargs.pop(strings.MAX_GAMES, self.max_games))
+        self.max_resident_games = int(kwargs.pop(strings.MAX_RESIDENT_GAMES, self.max_resident_games))
+        self.processing_workers = int(kwargs.pop(strings.PROCESSING_WORKERS, self.processing_workers))
+        self.notification_queue_limit = int(kwargs.pop(strings.NOTIFICATION_QUEUE_LIMIT,
+                                                       self.notification_queue_limit))
+        self.slow_client_policy = kwargs.pop(strings.SLOW_CLIENT_POLICY, self.slow_client_policy)
         self.remove_canceled_games = bool(kwargs.pop(strings.REMOVE_CANCELED_GAMES, self.remove_canceled_games))
         self.backup_delay_seconds = int(kwargs.pop(strings.BACKUP_DELAY_SECONDS, self.backup_delay_seconds))
         self.ping_seconds = int(kwargs.pop(strings.PING_SECONDS, self.ping_seconds))
         assert not kwargs
+        assert self.slow_client_policy in strings.ALL_SLOW_CLIENT_POLICIES
         LOGGER.debug('Ping        : %s', self.ping_seconds)
         LOGGER.debug('Backup delay: %s', self.backup_delay_seconds)
 
@@ -331,6 +369,11 @@ class Server:
             self.backup_delay_seconds = server_info[strings.BACKUP_DELAY_SECONDS]
             self.ping_seconds = server_info[strings.PING_SECONDS]
             self.max_games = server_info[strings.MAX_GAMES]
+            self.max_resident_games = server_info.get(strings.MAX_RESIDENT_GAMES, self.max_resident_games)
+            self.processing_workers = server_info.get(strings.PROCESSING_WORKERS, self.processing_workers)
+            self.notification_queue_limit = server_info.get(strings.NOTIFICATION_QUEUE_LIMIT,
+                                                            self.notification_queue_limit)
+            self.slow_client_policy = server_info.get(strings.SLOW_CLIENT_POLICY, self.slow_client_policy)
             self.remove_canceled_games = server_info[strings.REMOVE_CANCELED_GAMES]
             self.users = Users.from_dict(server_info[strings.USERS])
             self.available_maps = server_info[strings.AVAILABLE_MAPS]
@@ -401,7 +444,10 @@ class Server:
             :type server_game: ServerGame
         """
         LOGGER.debug('Processing game %s (status %s).', server_game.game_id, server_game.status)
-        previous_phase_data, current_phase_data, kicked_powers = server_game.process()
+        if self.processing_workers and server_game.is_game_active:
+            previous_phase_data, current_phase_data, kicked_powers = yield self._process_game_in_pool(server_game)
+        else:
+            previous_phase_data, current_phase_data, kicked_powers = server_game.process()
         self.save_game(server_game)
 
         if previous_phase_data is None and kicked_powers is None:
@@ -437,6 +483,58 @@ class Server:
         # Game must be stopped if not active.
         return not server_game.is_game_active
 
+    @gen.coroutine
+    def _process_game_in_pool(self, server_game):
+        """ Process given active game in processing pool.
+            Requests for this game received meanwhile are deferred until processing is done
+            (see wait_game_processing()).
+
+            :param server_game: server game to process
+            :return: same triple as ServerGame.process()
+            :type server_game: ServerGame
+        """
+        kicked_powers = server_game.kick_powers()
+        if kicked_powers:
+            return None, None, kicked_powers
+        if self.processing_pool is None:
+            # Workers are spawned (not forked), as forking a server process running threads may deadlock workers.
+            self.processing_pool = ProcessPoolExecutor(max_workers=self.processing_workers,
+                                                       mp_context=multiprocessing.get_context('spawn'))
+        # Waiters are released only once processing results are applied (or processing failed).
+        processing_done = Future()
+        self.games_in_processing[server_game.game_id] = processing_done
+        try:
+            processing_results = yield IOLoop.current().run_in_executor(
+                self.processing_pool, process_game_data, *server_game.get_processing_data())
+            return server_game.apply_processing_results(*processing_results)
+        finally:
+            del self.games_in_processing[server_game.game_id]
+            processing_done.set_result(None)
+
+    @gen.coroutine
+    def wait_game_processing(self, game_id):
+        """ Wait until given game is no more processed in processing pool. Return immediately otherwise. """
+        while game_id in self.games_in_processing:
+            yield self.games_in_processing[game_id]
+
+    def get_notification_queue(self, connection_handler):
+        """ Return notification queue of given connection handler, or None if connection has no queue yet.
+
+            :param connection_handler: connection handler
+            :rtype: NotificationQueue
+        """
+        return self.notification_queues.get(connection_handler, None)
+
+    def remove_notification_queue(self, connection_handler):
+        """ Remove notification queue of given connection handler (e.g. when connection is closed). """
+        self.notification_queues.pop(connection_handler, None)
+
+    def get_notification_queues_metrics(self):
+        """ Return a list of metrics (dictionaries, see NotificationQueue.get_metrics()) of notification queues,
+            one per connection which received notifications.
+        """
+        return [notification_queue.get_metrics() for notification_queue in self.notification_queues.values()]
+
     @gen.coroutine
     def _task_save_database(self):
         """ IO loop callable: save database and loaded games periodically.
@@ -446,19 +544,22 @@ class Server:
         while True:
             yield gen.sleep(self.backup_delay_seconds)
             self.backup_now()
+            self.evict_idle_games()
 
     @gen.coroutine
     def _task_send_notifications(self):
-        """ IO loop callback: consume notifications and send it. """
+        """ IO loop callback: consume notifications and dispatch them to connections queues.
+            Each connection queue is then sent independently (see NotificationQueue).
+        """
         LOGGER.info('Waiting for notifications to send.')
         while True:
             connection_handler, notification = yield self.notifications.get()
             try:
-                yield connection_handler.write_message(notification)
-            except WebSocketClosedError:
-                LOGGER.error('Websocket was closed while sending a notification.')
-            except StreamClosedError:
-                LOGGER.error('Stream was closed while sending a notification.')
+                notification_queue = self.get_notification_queue(connection_handler)
+                if notification_queue is None:
+                    notification_queue = NotificationQueue(self, connection_handler)
+                    self.notification_queues[connection_handler] = notification_queue
+                notification_queue.put(notification)
             finally:
                 self.notifications.task_done()
 
@@ -538,6 +639,10 @@ class Server:
             strings.BACKUP_DELAY_SECONDS: self.backup_delay_seconds,
             strings.PING_SECONDS: self.ping_seconds,
             strings.MAX_GAMES: self.max_games,
+            strings.MAX_RESIDENT_GAMES: self.max_resident_games,
+            strings.PROCESSING_WORKERS: self.processing_workers,
+            strings.NOTIFICATION_QUEUE_LIMIT: self.notification_queue_limit,
+            strings.SLOW_CLIENT_POLICY: self.slow_client_policy,
             strings.REMOVE_CANCELED_GAMES: self.remove_canceled_games,
             strings.USERS: self.users.to_dict(),
             strings.AVAILABLE_MAPS: self.available_maps,
@@ -662,7 +767,8 @@ class Server:
 
             :type server_game: ServerGame
         """
-        # Register game on memory.
+        # Make room and register game on memory.
+        self.evict_idle_games(nb_required=1)
         self.games[server_game.game_id] = server_game
         # Start DAIDE server for this game.
         self.start_new_daide_server(server_game.game_id)
@@ -678,11 +784,15 @@ class Server:
             :rtype: ServerGame
         """
         server_game = self.load_game(game_id)
-        if game_id not in self.games:
+        if game_id in self.games:
+            # Mark game as most recently used.
+            self.games.move_to_end(game_id)
+        else:
             LOGGER.debug('Game loaded: %s', game_id)
             # Check dummy powers for this game as soon as it's loaded from disk.
             self.register_dummy_power_names(server_game)
-            # Register game on memory.
+            # Make room and register game on memory.
+            self.evict_idle_games(nb_required=1)
             self.games[server_game.game_id] = server_game
             # Start DAIDE server for this game.
             self.start_new_daide_server(server_game.game_id)
@@ -699,6 +809,47 @@ class Server:
                     self.schedule_game(server_game)
         return server_game
 
+    def game_is_idle(self, server_game):
+        """ Return True if given loaded game can be safely removed from memory, i.e. if game has no token
+            currently attached to a connection, is not scheduled, and has no dummy powers waiting for a bot.
+
+            :param server_game: server game to check
+            :type server_game: ServerGame
+        """
+        return (server_game.game_id not in self.games_with_dummy_powers
+                and not self.games_scheduler.is_scheduled(server_game)
+                and not any(self.users.get_connection_handler(token)
+                            for _, token in server_game.get_reception_addresses()))
+
+    def unload_game(self, server_game):
+        """ Save given game on disk and remove it from memory.
+            Game will be reloaded from disk on next call to get_game().
+
+            :param server_game: server game to unload
+            :type server_game: ServerGame
+        """
+        game_id = server_game.game_id
+        game_path = os.path.join(ensure_path(self.games_path), '%s.json' % game_id)
+        if game_id in self.backup_games or not os.path.isfile(game_path):
+            save_json_on_disk(game_path, self.backup_games.pop(game_id, None) or server_game.to_dict())
+        self.games.pop(game_id, None)
+        self.stop_daide_server(game_id)
+        LOGGER.debug('Game unloaded: %s', game_id)
+
+    def evict_idle_games(self, nb_required=0):
+        """ Unload least recently used idle games until loaded games count, plus given number of
+            games about to be loaded, does not exceed max_resident_games. Do nothing if there is no limit.
+
+            :param nb_required: number of places to free for games about to be loaded.
+        """
+        if not self.max_resident_games:
+            return
+        for server_game in list(self.games.values()):
+            if len(self.games) + nb_required <= self.max_resident_games:
+                break
+            if self.game_is_idle(server_game):
+                self.unload_game(server_game)
+
     def delete_game(self, server_game):
         """ Delete given game from server (both from memory and disk)
             and perform any post-deletion processing.
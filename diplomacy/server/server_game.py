@@ -21,6 +21,39 @@ from diplomacy.engine.power import Power
 from diplomacy.utils import exceptions, parsing, strings
 from diplomacy.utils.game_phase_data import GamePhaseData
 
+# Game history fields. Not required to process a game phase (processing only appends new history entries).
+HISTORY_FIELDS = (strings.STATE_HISTORY, strings.ORDER_HISTORY, strings.MESSAGE_HISTORY, strings.RESULT_HISTORY)
+
+# Game model fields not updated from a game processed in a separate process. Server-side fields may have been
+# modified while game was processed, and history fields are updated separately.
+UNCOPIED_PROCESSED_FIELDS = {strings.OMNISCIENT_USERNAMES, strings.MODERATOR_USERNAMES, strings.OBSERVER,
+                             strings.OMNISCIENT, strings.POWERS} | set(HISTORY_FIELDS)
+
+# Power attributes not updated from a power processed in a separate process.
+UNCOPIED_PROCESSED_POWER_FIELDS = {'game', 'name', 'controller', 'tokens'}
+
+# Game engine attributes that are not saved in game model but are used across phases processing
+# (e.g. units dislodged in a movement phase are used to process next retreat phase).
+ENGINE_STATE_FIELDS = ('popped', 'orders', 'ordered_units', 'phase_type', 'combat', 'command', 'result', 'supports',
+                       'dislodged', 'convoy_paths', 'fixed_state')
+
+def process_game_data(game_data, engine_state):
+    """ Process a game phase from given game data and return processing results.
+        Designed to be run in a separate process (e.g. in a process pool), see ServerGame.get_processing_data().
+
+        :param game_data: game dictionary, without history, returned by ServerGame.get_processing_data().
+        :param engine_state: game engine state returned by ServerGame.get_processing_data().
+        :return: a triple (previous phase data dictionary, processed game dictionary, processed game engine state).
+            Processed game dictionary only contains history for processed phase.
+    """
+    server_game = ServerGame.from_dict(game_data)
+    for name, value in engine_state.items():
+        setattr(server_game, name, value)
+    previous_phase_data = Game.process(server_game)
+    return (previous_phase_data.to_dict(),
+            server_game.to_dict(),
+            {name: getattr(server_game, name) for name in ENGINE_STATE_FIELDS})
+
 class ServerGame(Game):
     """ ServerGame class.
 
@@ -477,7 +510,20 @@ class ServerGame(Game):
         """
         if not self.is_game_active:
             return None, None, None
-        # Kick powers if necessary.
+        kicked_powers = self.kick_powers()
+        if kicked_powers:
+            return None, None, kicked_powers
+        # Process game and retrieve previous state.
+        previous_phase_data = super(ServerGame, self).process()
+        return self._end_processing(previous_phase_data)
+
+    def kick_powers(self):
+        """ Kick controlled powers that did not submit orders (only if game has not rule CIVIL_DISORDER).
+            If any power is kicked, game is stopped (status set to forming) and cannot be processed.
+
+            :return: a dictionary mapping kicked power names to tokens previously associated to these powers
+                (empty if no power was kicked).
+        """
         all_orderable_locations = self.get_orderable_locations()
         kicked_powers = {}
         for power in self.powers.values():
@@ -493,12 +539,52 @@ class ServerGame(Game):
 
         if kicked_powers:
             # Some powers were kicked from an active game before processing.
-            # This game must be stopped and cannot be processed. We return info about kicked powers.
             self.set_status(strings.FORMING)
-            return None, None, kicked_powers
+        return kicked_powers
 
-        # Process game and retrieve previous state.
-        previous_phase_data = super(ServerGame, self).process()
+    def get_processing_data(self):
+        """ Return data required to process this game in a separate process with function process_game_data().
+
+            :return: a couple (game dictionary without history, game engine state dictionary)
+        """
+        game_data = {key: ({} if key in HISTORY_FIELDS else parsing.to_json(getattr(self, key), key_type))
+                     for key, key_type in self.get_model().items()}
+        return game_data, {name: getattr(self, name) for name in ENGINE_STATE_FIELDS}
+
+    def apply_processing_results(self, previous_phase_data_dict, processed_game_dict, engine_state):
+        """ Update this game with results returned by function process_game_data().
+            Server-side attributes (tokens, controllers, moderators and omniscient usernames) are kept.
+
+            :param previous_phase_data_dict: previous phase data dictionary returned by process_game_data().
+            :param processed_game_dict: processed game dictionary returned by process_game_data().
+            :param engine_state: processed game engine state returned by process_game_data().
+            :return: a triple (previous phase data, current phase data, None),
+                same as method process() for a correctly processed game.
+        """
+        processed_game = ServerGame.from_dict(processed_game_dict)
+        for name in self.get_model():
+            if name not in UNCOPIED_PROCESSED_FIELDS:
+                setattr(self, name, getattr(processed_game, name))
+        for name, value in engine_state.items():
+            setattr(self, name, value)
+        for processed_power in processed_game.powers.values():
+            power = self.get_power(processed_power.name)
+            for name in processed_power.__slots__:
+                if name not in UNCOPIED_PROCESSED_POWER_FIELDS:
+                    setattr(power, name, getattr(processed_power, name))
+        for field in HISTORY_FIELDS:
+            history = getattr(self, field)
+            for phase, value in getattr(processed_game, field).items():
+                history.put(self._phase_wrapper_type(str(phase)), value)
+        self.clear_cache()
+        return self._end_processing(GamePhaseData.from_dict(previous_phase_data_dict))
+
+    def _end_processing(self, previous_phase_data):
+        """ Update game status after a phase processing and return processing results.
+
+            :param previous_phase_data: phase data of processed phase.
+            :return: a triple (previous phase data, current phase data, None)
+        """
         if self.count_controlled_powers() < self.get_expected_controls_count():
             # There is no more enough controlled powers, we should stop game.
             self.set_status(strings.FORMING)
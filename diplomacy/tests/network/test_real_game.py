@@ -138,13 +138,14 @@ class CaseData:
     """ Helper class to store test data. """
     FILE_FOLDER_NAME = os.path.abspath(os.path.dirname(__file__))
 
-    def __init__(self, case_file_name, hostname=DEFAULT_HOSTNAME, port=DEFAULT_PORT):
+    def __init__(self, case_file_name, hostname=DEFAULT_HOSTNAME, port=DEFAULT_PORT, phase_data_delta=False):
         """ Initialize game test.
 
             :param case_file_name: File name of JSON file containing expected game data.
                 JSON file must be located in folder FILE_FOLDER_NAME.
             :param hostname: hostname to use to load server.
             :param port: port to use to load server.
+            :param phase_data_delta: if True, client connection asks for phase data deltas.
         """
         full_file_path = os.path.join(self.FILE_FOLDER_NAME, case_file_name)
         with open(full_file_path, 'rb') as file:
@@ -166,6 +167,7 @@ class CaseData:
 
         self.hostname = hostname
         self.port = port
+        self.phase_data_delta = phase_data_delta
 
     def terminate_game(self, power_name):
         """ Tell Tornado that a power game is finished. """
@@ -545,7 +547,8 @@ def main(case_data):
     # ================
     if case_data.admin_channel is None:
         LOGGER.info('Creating connection, admin channel and admin game.')
-        case_data.connection = yield connect(case_data.hostname, case_data.port)
+        case_data.connection = yield connect(case_data.hostname, case_data.port,
+                                             phase_data_delta=case_data.phase_data_delta)
         case_data.admin_channel = yield case_data.connection.authenticate('admin', 'password')
         # NB: For all test cases, first game state should be default game engine state when starting.
         # So, we don't need to pass game state of first expected phase when creating a server game.
@@ -618,13 +621,35 @@ def test_maps():
 def test_3():
     """ Test case 3. """
     case_data = CaseData('3.json')
-    run(case_data, ping_seconds=constants.DEFAULT_PING_SECONDS)
+    run(case_data, ping_seconds=constants.DEFAULT_PING_SECONDS, processing_workers=0)
     # We must clear server caches to allow to re-create a Server with same test case but different server attributes.
     Server.__cache__.clear()
 
 def test_3_ping_1s():
     """ Test case 3 with small ping (1 second). """
     case_data = CaseData('3.json')
-    run(case_data, ping_seconds=1)
+    run(case_data, ping_seconds=1, processing_workers=0)
+    # We must clear server caches to allow to re-create a Server with same test case but different server attributes.
+    Server.__cache__.clear()
+
+def test_3_processing_workers():
+    """ Test case 3 with games processed in a pool of 2 worker processes. """
+    case_data = CaseData('3.json')
+    run(case_data, ping_seconds=constants.DEFAULT_PING_SECONDS, processing_workers=2)
+    # We must clear server caches to allow to re-create a Server with same test case but different server attributes.
+    Server.__cache__.clear()
+
+def test_3_phase_data_delta():
+    """ Test case 3 with phase data deltas sent by server. """
+    case_data = CaseData('3.json', phase_data_delta=True)
+    run(case_data, ping_seconds=constants.DEFAULT_PING_SECONDS, processing_workers=0)
+    # We must clear server caches to allow to re-create a Server with same test case but different server attributes.
+    Server.__cache__.clear()
+
+def test_3_slow_client_resync():
+    """ Test case 3 with small notification queues, so that clients often have to synchronize games. """
+    case_data = CaseData('3.json')
+    run(case_data, ping_seconds=constants.DEFAULT_PING_SECONDS, processing_workers=0,
+        notification_queue_limit=3, slow_client_policy=strings.RESYNC)
     # We must clear server caches to allow to re-create a Server with same test case but different server attributes.
     Server.__cache__.clear()
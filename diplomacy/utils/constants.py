@@ -31,6 +31,12 @@ DEFAULT_PING_SECONDS = 30
 # Time to wait to receive a response for a request sent to server.
 REQUEST_TIMEOUT_SECONDS = 30
 
+# Maximum number of notifications server sends to a connection in a single websocket message.
+NOTIFICATIONS_BATCH_SIZE = 100
+
+# Default maximum number of pending notifications server keeps for a connection (0 means no limit).
+DEFAULT_NOTIFICATION_QUEUE_LIMIT = 1000
+
 # Default host name for a server to connect to.
 DEFAULT_HOST = 'localhost'
 
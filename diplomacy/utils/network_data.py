@@ -27,13 +27,15 @@
 """
 import uuid
 
-from diplomacy.utils import strings, exceptions
+import ujson as json
+
+from diplomacy.utils import strings, exceptions, parsing
 from diplomacy.utils.common import assert_no_common_keys, camel_case_to_snake_case
 from diplomacy.utils.jsonable import Jsonable
 
 class NetworkData(Jsonable):
     """ Abstract class for network-exchanged data. """
-    __slots__ = ['name']
+    __slots__ = ['name', 'params_json']
     # NB: header must have a `name` field and a field named `id_field`.
     header = {}
     params = {}
@@ -41,6 +43,9 @@ class NetworkData(Jsonable):
 
     def __init__(self, **kwargs):
         self.name = None  # type: str
+        # Optional JSON string of parameters, that may be shared by many network data objects
+        # with same parameters but different headers. See method json().
+        self.params_json = None  # type: str
 
         # Setting default values
         kwargs[strings.NAME] = kwargs.get(strings.NAME, None) or self.get_class_name()
@@ -57,6 +62,22 @@ class NetworkData(Jsonable):
         """ Returns the class name in snake_case. """
         return camel_case_to_snake_case(cls.__name__)
 
+    def params_to_json(self):
+        """ Return a JSON string containing only parameters of this object. """
+        model = self.get_model()
+        return json.dumps({key: parsing.to_json(getattr(self, key), model[key]) for key in self.params})
+
+    def json(self):
+        """ Convert this object to a JSON string. If params_json is set, only header is serialized,
+            and parameters are spliced from params_json.
+        """
+        if self.params_json is None or not self.params:
+            return super(NetworkData, self).json()
+        model = self.get_model()
+        header_json = json.dumps({key: parsing.to_json(getattr(self, key), model[key])
+                                  for key in model if key not in self.params})
+        return '%s,%s' % (header_json[:-1], self.params_json[1:])
+
     @classmethod
     def validate_params(cls):
         """ Called when getting model to validate parameters. Called once per class. """
@@ -17,25 +17,82 @@
 """ Priority Dict implementation """
 import heapq
 
-# ------------------------------------------------
-# Adapted from (2018/03/14s):
-# https://docs.python.org/3.6/library/heapq.html#priority-queue-implementation-notes
-# Unlicensed
+# Positions of fields in a heap entry.
+_VALUE, _ORDER, _KEY, _INDEX = 0, 1, 2, 3
+
+def _entry_lt(entry, other):
+    """ Return True if given heap entry must be placed before other heap entry. Ties are ordered by insertion.
+        Only operator < is used to compare priority values.
+    """
+    return entry[_VALUE] < other[_VALUE] or (not other[_VALUE] < entry[_VALUE] and entry[_ORDER] < other[_ORDER])
+
+class _Node:
+    """ (internal) Wrapper around a heap entry, used to iterate over heap without modifying it. """
+    __slots__ = ['entry']
+
+    def __init__(self, entry):
+        self.entry = entry
+
+    def __lt__(self, other):
+        return _entry_lt(self.entry, other.entry)
+
 class PriorityDict(dict):
-    """ Priority Dictionary Implementation """
+    """ Priority Dictionary Implementation.
+
+        Based on an indexed binary heap: each heap entry knows its position in heap, so that
+        a key priority can be updated or removed in O(log n) without leaving invalid entries in heap.
+    """
 
     def __init__(self, **kwargs):
         """ Initialize the priority queue.
 
             :param kwargs: (optional) initial values for priority queue.
         """
-        self.__heap = []  # Heap for entries. An entry is a triple (priority value, key, valid entry flag (boolean)).
+        # Heap for entries. An entry is a list [priority value, insertion order, key, index of entry in heap].
+        self.__heap = []
+        self.__counter = 0
         # Dict itself maps key to entries. We override some dict methods (see __getitem__() below)
         # to always return priority value instead of entry as dict value.
         dict.__init__(self)
         for key, value in kwargs.items():
             self[key] = value
 
+    def __move(self, entry, index):
+        """ Place given entry at given heap index. """
+        self.__heap[index] = entry
+        entry[_INDEX] = index
+
+    def __sift_up(self, index):
+        """ Move entry at given index up to its place in heap. """
+        heap = self.__heap
+        entry = heap[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if not _entry_lt(entry, parent):
+                break
+            self.__move(parent, index)
+            index = parent_index
+        self.__move(entry, index)
+
+    def __sift_down(self, index):
+        """ Move entry at given index down to its place in heap. """
+        heap = self.__heap
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            if child_index + 1 < size and _entry_lt(heap[child_index + 1], heap[child_index]):
+                child_index += 1
+            child = heap[child_index]
+            if not _entry_lt(child, entry):
+                break
+            self.__move(child, index)
+            index = child_index
+        self.__move(entry, index)
+
     def __setitem__(self, key, val):
         """ Sets a key with his associated priority
 
@@ -44,33 +101,51 @@ class PriorityDict(dict):
             :return: None
         """
         if key in self:
-            del self[key]
-        # Create entry with val, key and a boolean indicating that entry is valid (True).
-        entry = [val, key, True]
-        dict.__setitem__(self, key, entry)
-        heapq.heappush(self.__heap, entry)
+            # Update entry in place (decrease or increase key).
+            entry = dict.__getitem__(self, key)
+            entry[_VALUE] = val
+            self.__sift_up(entry[_INDEX])
+            self.__sift_down(entry[_INDEX])
+        else:
+            # Create entry with val, insertion order, key and position in heap.
+            entry = [val, self.__counter, key, len(self.__heap)]
+            self.__counter += 1
+            dict.__setitem__(self, key, entry)
+            self.__heap.append(entry)
+            self.__sift_up(entry[_INDEX])
 
     def __delitem__(self, key):
-        """ Removes key from dict and marks associated heap entry as invalid (False).
-            Raises KeyError if not found.
-        """
-        entry = self.pop(key)
-        entry[-1] = False
+        """ Removes key from dict and associated entry from heap. Raises KeyError if not found. """
+        entry = dict.pop(self, key)
+        last_entry = self.__heap.pop()
+        if last_entry is not entry:
+            # Replace removed entry with last heap entry and restore heap.
+            self.__move(last_entry, entry[_INDEX])
+            self.__sift_up(last_entry[_INDEX])
+            self.__sift_down(last_entry[_INDEX])
 
     def __getitem__(self, key):
         """ Returns priority value associated to key. Raises KeyError if key not found. """
-        return dict.__getitem__(self, key)[0]
+        return dict.__getitem__(self, key)[_VALUE]
 
     def __iter__(self):
-        """ Iterator over all keys based on their priority. """
+        """ Iterator over all keys based on their priority.
+            Heap is not copied: iterating over first k keys costs O(k log k).
+            Priority dict must not be modified during iteration.
+        """
 
         def iterfn():
             """ Iterator """
-            copy_of_self = self.copy()
-            while copy_of_self:
-                _, key = copy_of_self.smallest()
-                del copy_of_self[key]
-                yield key
+            heap = self.__heap
+            if not heap:
+                return
+            frontier = [_Node(heap[0])]
+            while frontier:
+                entry = heapq.heappop(frontier).entry
+                yield entry[_KEY]
+                for child_index in (2 * entry[_INDEX] + 1, 2 * entry[_INDEX] + 2):
+                    if child_index < len(heap):
+                        heapq.heappush(frontier, _Node(heap[child_index]))
 
         return iterfn()
 
@@ -79,9 +154,10 @@ class PriorityDict(dict):
 
             :return: A tuple of (priority, key) for the item with the smallest priority, or None if dict is empty.
         """
-        while self.__heap and not self.__heap[0][-1]:
-            heapq.heappop(self.__heap)
-        return self.__heap[0][:2] if self.__heap else None
+        if self.__heap:
+            entry = self.__heap[0]
+            return entry[_VALUE], entry[_KEY]
+        return None
 
     def setdefault(self, key, d=None):
         """ Sets a default for a given key """
@@ -94,7 +170,7 @@ class PriorityDict(dict):
 
             :rtype: PriorityDict
         """
-        return PriorityDict(**{key: entry[0] for key, entry in dict.items(self)})
+        return PriorityDict(**{key: entry[_VALUE] for key, entry in dict.items(self)})
 
     def keys(self):
         """ Make sure keys() iterates on keys based on their priority. """
@@ -23,7 +23,7 @@ class SchedulerEvent(Jsonable):
 
         Properties:
 
-        - **time_unit**: unit time (in seconds) used by scheduler (time between 2 tasks checkings).
+        - **time_unit**: unit time (in seconds) used by scheduler to count delays (may be lower than 1).
           Currently 1 second in server scheduler.
         - **time_added**: scheduler time (nb. time units) when data was added to scheduler.
         - **delay**: scheduler time (nb. time units) to wait before processing time.
@@ -31,14 +31,14 @@ class SchedulerEvent(Jsonable):
     """
     __slots__ = ['time_unit', 'time_added', 'delay', 'current_time']
     model = {
-        'time_unit': int,
+        'time_unit': float,
         'time_added': int,
         'delay': int,
         'current_time': int
     }
 
     def __init__(self, **kwargs):
-        self.time_unit = 0
+        self.time_unit = 0.
         self.time_added = 0
         self.delay = 0
         self.current_time = 0
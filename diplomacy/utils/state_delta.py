@@ -0,0 +1,86 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+""" Utility functions to encode a game state as a delta against another game state.
+
+    A state delta is a dictionary with following fields:
+
+    - **base_name**: name (short phase name) of base state.
+    - **base_hash**: zobrist hash of base state.
+    - **replace**: dictionary of state fields to set in new state.
+    - **update**: dictionary mapping a dictionary state field (e.g. units) to changed entries
+      in this field (e.g. units of powers which units changed).
+    - **remove**: list of base state fields to remove from new state.
+
+    Base name and hash are used to check that a delta is applied on expected base state.
+"""
+BASE_NAME = 'base_name'
+BASE_HASH = 'base_hash'
+REPLACE = 'replace'
+UPDATE = 'update'
+REMOVE = 'remove'
+
+def compute_state_delta(base_state, state):
+    """ Compute and return delta to get given state from given base state.
+        State timestamp is always put into delta, as it is generated for each state.
+
+        :param base_state: base state (dictionary returned by Game.get_state()).
+        :param state: new state.
+        :return: a state delta dictionary.
+        :type base_state: dict
+        :type state: dict
+    """
+    replace = {}
+    update = {}
+    for key, value in state.items():
+        if key not in base_state:
+            replace[key] = value
+            continue
+        base_value = base_state[key]
+        if key != 'timestamp' and value == base_value:
+            continue
+        if isinstance(value, dict) and isinstance(base_value, dict) and value.keys() == base_value.keys():
+            update[key] = {entry_key: entry_value for entry_key, entry_value in value.items()
+                           if entry_value != base_value[entry_key]}
+        else:
+            replace[key] = value
+    return {BASE_NAME: base_state['name'],
+            BASE_HASH: str(base_state['zobrist_hash']),
+            REPLACE: replace,
+            UPDATE: update,
+            REMOVE: [key for key in base_state if key not in state]}
+
+def apply_state_delta(base_state, state_delta):
+    """ Apply given state delta on given base state and return new state.
+        Base state is not modified.
+
+        :param base_state: base state (dictionary returned by Game.get_state()).
+        :param state_delta: state delta returned by compute_state_delta().
+        :return: a new state, or None if base state does not match state delta base name and hash.
+        :type base_state: dict
+        :type state_delta: dict
+    """
+    if (base_state.get('name', None) != state_delta[BASE_NAME]
+            or str(base_state.get('zobrist_hash', None)) != state_delta[BASE_HASH]):
+        return None
+    state = dict(base_state)
+    for key in state_delta[REMOVE]:
+        del state[key]
+    for key, entries in state_delta[UPDATE].items():
+        state[key] = dict(state[key])
+        state[key].update(entries)
+    state.update(state_delta[REPLACE])
+    return state
@@ -33,6 +33,7 @@ ALWAYS_OMNISCIENT = 'always_omniscient'
 AUTHENTICATION_TYPE = 'authentication_type'
 AVAILABLE_MAPS = 'available_maps'
 BACKUP_DELAY_SECONDS = 'backup_delay_seconds'
+BATCH_NOTIFICATIONS = 'batch_notifications'
 BODY = 'body'
 BUFFER_SIZE = 'buffer_size'
 CANCELED = 'canceled'
@@ -58,6 +59,7 @@ DEADLINE = 'deadline'
 DEMOTE = 'demote'
 DESC = 'desc'
 DESIRED_COUNTRIES = 'desired_countries'
+DISCONNECT = 'disconnect'
 DUMMY = 'dummy'
 DUMMY_PLAYER = 'dummy_player'
 DUMMY_POWERS = 'dummy_powers'
@@ -92,6 +94,7 @@ MAPS = 'maps'
 MAPS_MTIME = 'maps_mtime'
 MASTER_TYPE = 'master_type'
 MAX_GAMES = 'max_games'
+MAX_RESIDENT_GAMES = 'max_resident_games'
 MESSAGE = 'message'
 MESSAGE_BYTES = 'message_bytes'
 MESSAGE_HISTORY = 'message_history'
@@ -108,6 +111,7 @@ NO = 'no'
 NO_RULES = 'no_rules'
 NO_WAIT = 'no_wait'
 NOTE = 'note'
+NOTIFICATION_QUEUE_LIMIT = 'notification_queue_limit'
 NOTIFICATION = 'notification'
 NOTIFICATION_ID = 'notification_id'
 OBSERVER = 'observer'
@@ -137,6 +141,7 @@ PAUSED = 'paused'
 PHASE = 'phase'
 PHASE_ABBR = 'phase_abbr'
 PHASE_DATA = 'phase_data'
+PHASE_DATA_DELTA = 'phase_data_delta'
 PHASE_DATA_TYPE = 'phase_data_type'
 PING_SECONDS = 'ping_seconds'
 PLAYER_ID = 'player_id'
@@ -156,6 +161,7 @@ POWERS_KICKED = 'powers_kicked'
 PREVIOUS_PHASE = 'previous_phase'
 PREVIOUS_PHASE_DATA = 'previous_phase_data'
 PREVIOUS_STATE = 'previous_state'
+PROCESSING_WORKERS = 'processing_workers'
 PROMOTE = 'promote'
 PROPOSAL = 'proposal'
 RE_SENT = 're_sent'
@@ -168,6 +174,7 @@ REMOVE_CANCELED_GAMES = 'remove_canceled_games'
 REMOVE_ENDED_GAMES = 'remove_ended_games'
 REQUEST = 'request'
 REQUEST_ID = 'request_id'
+RESYNC = 'resync'
 RESPONSE_BYTES = 'response_bytes'
 RESULT = 'result'
 RESULT_HISTORY = 'result_history'
@@ -180,6 +187,7 @@ SENDER = 'sender'
 SERVER_TYPE = 'server_type'
 SET_ORDER = 'set_order'
 SETTINGS = 'settings'
+SLOW_CLIENT_POLICY = 'slow_client_policy'
 START_AUTO = 'start_auto'
 START_MASTER = 'start_master'
 START_MODE = 'start_mode'
@@ -227,6 +235,7 @@ ALL_GRADES = {OMNISCIENT, ADMIN, MODERATOR}
 ALL_COMM_LEVELS = {CHANNEL, GAME}
 ALL_VOTE_DECISIONS = {YES, NO, NEUTRAL}
 ALL_ROLE_TYPES = {OBSERVER_TYPE, OMNISCIENT_TYPE, SERVER_TYPE}
+ALL_SLOW_CLIENT_POLICIES = {RESYNC, DISCONNECT}
 ALL_STATE_TYPES = {STATE_HISTORY, STATE, PHASE}
 
 def role_is_special(role):
@@ -15,6 +15,8 @@
 #  with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ==============================================================================
 """ Test class PriorityDict. """
+import random
+
 from diplomacy.utils.priority_dict import PriorityDict
 from diplomacy.utils.tests.test_common import assert_equals
 
@@ -100,3 +102,33 @@ def test_iterations():
     # Priority dict should have not been modified.
     assert_equals(len(priorities), len(priority_dict))
     assert all(key in priority_dict for key in expected_sorted_keys)
+
+def test_priority_updates_and_removals():
+    """ Test PriorityDict with many priority updates and removals, compared to a sorted reference. """
+    random_generator = random.Random(0)
+    priority_dict = PriorityDict()
+    expected = {}
+    for _ in range(2000):
+        key = random_generator.randrange(50)
+        if key in expected and random_generator.random() < 0.3:
+            del priority_dict[key]
+            del expected[key]
+        else:
+            priority = random_generator.randrange(1000)
+            priority_dict[key] = priority
+            expected[key] = priority
+        assert_equals(len(expected), len(priority_dict))
+        if expected:
+            smallest_priority, smallest_key = priority_dict.smallest()
+            assert_equals(min(expected.values()), smallest_priority)
+            assert_equals(expected[smallest_key], smallest_priority)
+    assert_equals(sorted(expected.values()), list(priority_dict.values()))
+    assert_equals(expected, dict(priority_dict.items()))
+
+def test_ties_ordered_by_insertion():
+    """ Test PriorityDict keys with same priority are iterated in insertion order. """
+    priority_dict = PriorityDict()
+    for key in 'dcbae':
+        priority_dict[key] = 1
+    priority_dict['z'] = 0
+    assert list(priority_dict.keys()) == ['z', 'd', 'c', 'b', 'a', 'e']
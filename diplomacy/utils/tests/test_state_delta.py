@@ -0,0 +1,44 @@
+# ==============================================================================
+# Copyright (C) 2019 - Philip Paquette, Steven Bocco
+#
+#  This program is free software: you can redistribute it and/or modify it under
+#  the terms of the GNU Affero General Public License as published by the Free
+#  Software Foundation, either version 3 of the License, or (at your option) any
+#  later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+#  FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+#  details.
+#
+#  You should have received a copy of the GNU Affero General Public License along
+#  with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ==============================================================================
+""" Test game state deltas. """
+from diplomacy.engine.game import Game
+from diplomacy.utils.state_delta import apply_state_delta, compute_state_delta
+from diplomacy.utils.tests.test_common import assert_equals
+
+def test_state_delta():
+    """ Test state delta computed between two consecutive game states. """
+    game = Game()
+    game.set_orders('FRANCE', ['A PAR - BUR', 'F BRE - MAO'])
+    game.set_orders('GERMANY', ['A MUN - RUH'])
+    base_state = game.get_state()
+    game.process()
+    state = game.get_state()
+    state_delta = compute_state_delta(base_state, state)
+    # Homes did not change and should not be sent.
+    assert 'homes' not in state_delta['replace'] and 'homes' not in state_delta['update']
+    # Only units of moved powers should be sent.
+    assert_equals({'FRANCE', 'GERMANY'}, set(state_delta['update']['units']))
+    assert_equals(state, apply_state_delta(base_state, state_delta))
+
+def test_state_delta_base_mismatch():
+    """ Test state delta is not applied on a wrong base state. """
+    game = Game()
+    base_state = game.get_state()
+    game.set_orders('FRANCE', ['A PAR - BUR'])
+    game.process()
+    state_delta = compute_state_delta(base_state, game.get_state())
+    assert apply_state_delta(game.get_state(), state_delta) is None
@@ -95,6 +95,10 @@ export const NOTIFICATION_MANAGERS = {
     power_wait_flag: function (game, notification) {
         game.local.setWait(notification.power_name, notification.wait);
     },
+    synchronization_required: function (game, notification) {
+        // Server dropped notifications for this game: get missed updates.
+        game.synchronize();
+    },
     vote_count_updated: function (game, notification) {
         // Nothing currently done.
     },
@@ -35,6 +35,7 @@ export const NOTIFICATIONS = {
         power_vote_updated: STRINGS.GAME,
         power_wait_flag: STRINGS.GAME,
         powers_controllers: STRINGS.GAME,
+        synchronization_required: STRINGS.GAME,
         vote_count_updated: STRINGS.GAME,
         vote_updated: STRINGS.GAME,
     },